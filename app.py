@@ -0,0 +1,477 @@
+"""📊 データ分析学習アプリ
+
+気象データを題材に、ゲーム感覚で統計分析を学べるStreamlitアプリ。
+経験値とレベルアップで学習のモチベーションを保ちながら、
+基本統計・グラフ・相関・時系列分析を体験できる。
+"""
+
+import hashlib
+import io
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+# plotlyのimportは~150ファイルのモジュール走査を伴いコールドスタートに
+# 数百msを上乗せするため、各Figure構築関数の中で遅延importする。
+
+from education.stats_concepts import (
+    explain_concept,
+    get_step,
+    generate_encouragement,
+    get_hint_for_difficulty,
+)
+
+st.set_page_config(
+    page_title="📊 データ分析学習アプリ",
+    page_icon="📊",
+    layout="wide",
+)
+
+@st.cache_resource
+def _css() -> str:
+    """アプリ共通のスタイル定義を一度だけ構築して保持する"""
+    return """
+    <style>
+    .main-header {
+        font-size: 2.2rem;
+        font-weight: bold;
+        background: linear-gradient(90deg, #1e88e5, #42a5f5);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        padding: 0.5rem 0;
+    }
+    .level-badge {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        text-align: center;
+        font-weight: bold;
+        margin-bottom: 0.5rem;
+    }
+    .stat-card {
+        background-color: #f0f7ff;
+        border-left: 4px solid #1e88e5;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }
+    .concept-box {
+        background-color: #fffde7;
+        border: 1px solid #ffd54f;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }
+    </style>
+    """
+
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+
+# レベル1〜10の称号。連番キーの辞書よりタプルの添字参照の方が
+# ハッシュ計算なしのポインタ参照1回で済む。
+_LEVEL_TITLES = (
+    "🌱 気象見習い",
+    "🌤️ 天気初心者",
+    "⛅ データ観察員",
+    "🌦️ 統計研究生",
+    "🌈 分析担当官",
+    "📊 グラフ職人",
+    "🔍 相関探偵",
+    "📈 予報士見習い",
+    "🎓 データ博士",
+    "👑 気象マスター",
+)
+
+
+def get_level_title(level):
+    """レベルに応じた称号を返す"""
+    return _LEVEL_TITLES[min(level, 10) - 1]
+
+
+def add_experience(points):
+    """経験値を加算し、必要ならレベルアップする"""
+    st.session_state.experience += points
+    required = st.session_state.level * 100
+    if st.session_state.experience >= required:
+        st.session_state.experience -= required
+        st.session_state.level += 1
+        # お祝い演出は再実行後に出す(ここで出してもrerunで消えてしまう)
+        st.session_state.level_up = True
+    # fragment内のボタンから呼ばれるため、サイドバーのレベル・経験値表示を
+    # 同期させるにはアプリ全体の再実行が必要
+    st.rerun(scope="app")
+
+
+@st.cache_data(show_spinner=False)
+def load_csv(data: bytes, name: str) -> pd.DataFrame:
+    """アップロードされたCSVバイト列をDataFrameに変換する
+
+    ファイル内容(bytes)とファイル名をキャッシュキーにすることで、
+    同じファイルのままの再実行では解析済みDataFrameを再利用する。
+    解析にはマルチスレッド+SIMDのpyarrowエンジンを使い、
+    pyarrowが無い環境だけ従来のCエンジンにフォールバックする。
+    返すDataFrameはArrowバックエンド(列指向・ゼロコピー参照)に変換し、
+    以降の列アクセスや集計がArrowのSIMDカーネルで処理されるようにする。
+    """
+    try:
+        df = pd.read_csv(io.BytesIO(data), encoding="utf-8", engine="pyarrow")
+        return df.convert_dtypes(dtype_backend="pyarrow")
+    except ImportError:
+        return pd.read_csv(io.BytesIO(data), encoding="utf-8")
+
+
+# DataFrameは session_state に保持され再実行をまたいで同一オブジェクトのため、
+# 内容のハッシュ化は省略して id と shape でフィンガープリントする。
+_DF_HASH = {pd.DataFrame: lambda d: (id(d), d.shape)}
+
+
+@st.cache_data(hash_funcs=_DF_HASH)
+def basic_stats(df: pd.DataFrame, col: str):
+    """指定列の基本統計量(平均・中央値・標準偏差・最頻値)を計算して記憶する
+
+    数値列と分かっているので、pandasのディスパッチを経由せず
+    NumPyのufuncで直接計算する。
+    """
+    arr = df[col].to_numpy(dtype=np.float64, copy=False)
+    arr = arr[~np.isnan(arr)]
+    if arr.size == 0:
+        return float("nan"), float("nan"), float("nan"), "なし"
+    vals, counts = np.unique(arr, return_counts=True)
+    mode_val = vals[counts.argmax()]
+    return np.mean(arr), np.median(arr), np.std(arr, ddof=1), mode_val
+
+
+@st.cache_data(hash_funcs=_DF_HASH)
+def corr_of(df: pd.DataFrame, a: str, b: str) -> float:
+    """2列間の相関係数を計算して記憶する
+
+    pandasの汎用パスを避け、ピアソンの定義式をNumPyで直接計算する。
+    中心化後の内積はBLASにディスパッチされSIMDで処理される。
+    """
+    x = df[a].to_numpy(dtype=np.float64)
+    y = df[b].to_numpy(dtype=np.float64)
+    m = ~(np.isnan(x) | np.isnan(y))
+    x = x[m] - x[m].mean()
+    y = y[m] - y[m].mean()
+    denom = np.sqrt((x @ x) * (y @ y))
+    if denom == 0:
+        return float("nan")
+    return float(x @ y / denom)
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def parse_dates(df: pd.DataFrame, col: str) -> pd.Series:
+    """日付列を一度だけdatetimeに変換して記憶する
+
+    format指定でdateutilのフォールバック解析を避け、cache=Trueで
+    重複する日付文字列の再解析も省く。
+    """
+    return pd.to_datetime(df[col], format="mixed", cache=True)
+
+
+# Plotlyはトレース構築時に全キーをディープ検証するため、Figure生成は高コスト。
+# Figureは可変なグローバルオブジェクトなので cache_data ではなく cache_resource で保持する。
+_FIG_HASH = {pd.DataFrame: id}
+
+
+# 全行をそのままPlotlyに渡すとJSONペイロードとブラウザ描画が行数に比例して
+# 重くなるため、ヒストグラムはサーバ側で集計し、散布図は上限まで間引く。
+_SCATTER_MAX_POINTS = 5000
+
+
+@st.cache_resource
+def _hist_base():
+    """ヒストグラム用の空Figureを一度だけ構築して保持する
+
+    Figureコンストラクタはトレース/レイアウトの全キーをディープ検証する
+    のが実行コストの大半なので、骨組みは1回だけ作り、再実行ごとには
+    データ配列とタイトルの差し替えだけを行う。
+    """
+    # graph_objectsはここでしか使わないため、コールドスタートを軽くするよう遅延import
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(x=[], y=[]))
+    fig.update_layout(yaxis_title="度数", bargap=0.05)
+    return fig
+
+
+def hist_fig(df: pd.DataFrame, col: str, mean: float, median: float):
+    """平均・中央値の補助線付きヒストグラムを返す
+
+    ビン集計はnp.histogramでサーバ側に寄せ、ブラウザへはビン数分の
+    棒グラフだけを送る。Figure本体はキャッシュ済みの骨組みを書き換える。
+    """
+    data = df[col].dropna().to_numpy()
+    counts, edges = np.histogram(data, bins=20)
+    fig = _hist_base()
+    fig.data[0].x = (edges[:-1] + edges[1:]) / 2
+    fig.data[0].y = counts
+    fig.layout.title.text = f"{col}の分布"
+    fig.layout.xaxis.title.text = col
+    # 前回の平均・中央値の補助線を消してから引き直す
+    fig.layout.shapes = ()
+    fig.layout.annotations = ()
+    fig.add_vline(x=mean, line_dash="dash", line_color="red", annotation_text="平均値")
+    fig.add_vline(x=median, line_dash="dot", line_color="green", annotation_text="中央値")
+    return fig
+
+
+@st.cache_resource(hash_funcs=_FIG_HASH)
+def box_fig(df: pd.DataFrame, col: str):
+    """箱ひげ図を構築して保持する"""
+    import plotly.express as px
+
+    return px.box(df, y=col, title=f"{col}の箱ひげ図")
+
+
+@st.cache_resource(hash_funcs=_FIG_HASH)
+def scatter_fig(df: pd.DataFrame, x: str, y: str):
+    """散布図を構築して保持する(大規模データは間引いて描画)"""
+    import plotly.express as px
+
+    if len(df) > _SCATTER_MAX_POINTS:
+        df = df.sample(_SCATTER_MAX_POINTS, random_state=0)
+    return px.scatter(df, x=x, y=y, title=f"{x} と {y} の関係")
+
+
+@st.cache_resource(hash_funcs=_FIG_HASH)
+def line_fig(df: pd.DataFrame, x: str, y: str):
+    """折れ線グラフを構築して保持する"""
+    import plotly.express as px
+
+    return px.line(df, x=x, y=y, title=f"{y}の推移")
+
+
+@st.cache_data(ttl=3600)
+def make_sample_weather(seed: int = 42, n: int = 30) -> pd.DataFrame:
+    """シード付きサンプル気象データを生成する
+
+    Streamlitはウィジェット操作のたびにスクリプト全体を再実行するため、
+    cache_dataでメモ化して同一シードの再生成を避ける。
+    """
+    dates = pd.date_range("2024-01-01", periods=n, freq="D")
+    # レガシーのグローバルRandomStateはロックを挟むため、Generator APIを使う
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "日付": dates,
+            "気温": rng.normal(15, 8, n).round(1),
+            "湿度": rng.normal(60, 15, n).round(1),
+            "降水量": rng.exponential(2, n).round(1),
+            "風速": rng.gamma(2, 2, n).round(1),
+        }
+    )
+    return df
+
+
+# ---------------------------------------------------------------------------
+# セッション状態の初期化
+# ---------------------------------------------------------------------------
+if "level" not in st.session_state:
+    st.session_state.level = 1
+if "experience" not in st.session_state:
+    st.session_state.experience = 0
+
+# ---------------------------------------------------------------------------
+# サイドバー: 学習ステータス
+# ---------------------------------------------------------------------------
+with st.sidebar:
+    st.markdown(
+        f'<div class="level-badge">Lv.{st.session_state.level} '
+        f"{get_level_title(st.session_state.level)}</div>",
+        unsafe_allow_html=True,
+    )
+    required = st.session_state.level * 100
+    progress = st.session_state.experience / required
+    st.progress(progress)
+    st.caption(f"経験値: {st.session_state.experience} / {required}")
+    st.info(generate_encouragement(progress * 100))
+
+    with st.expander("📚 学習の進め方"):
+        for step in range(1, 6):
+            info = get_step(step)
+            st.markdown(f"**Step {step}: {info['title']}**")
+            st.caption(info["description"])
+
+
+@st.fragment
+def analysis_panel(df, numeric_columns):
+    """分析モードの選択と結果表示をまとめたパネル
+
+    st.fragmentで囲むことで、パネル内のウィジェット変更はこの関数だけを
+    再実行し、スクリプト全体(サイドバーやデータ読み込み)の再実行を避ける。
+    """
+    st.subheader("🔬 データ分析結果")
+    analysis_mode = st.radio(
+        "分析モード",
+        ["基本統計", "グラフ表示", "相関関係", "時系列分析"],
+        horizontal=True,
+    )
+    selected_column = st.selectbox("分析する列", numeric_columns)
+
+    if analysis_mode == "基本統計":
+        mean_val, median_val, std_val, mode_val = basic_stats(df, selected_column)
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("平均値", f"{mean_val:.2f}")
+        m2.metric("中央値", f"{median_val:.2f}")
+        m3.metric("標準偏差", f"{std_val:.2f}")
+        m4.metric("最頻値", f"{mode_val}")
+
+        concept = st.selectbox(
+            "📖 概念を学ぶ", ["mean", "median", "mode", "std"],
+            format_func=lambda c: explain_concept(c).get("name", c),
+        )
+        info = explain_concept(concept)
+        st.markdown(
+            f'<div class="concept-box"><b>{info["name"]}</b><br>'
+            f'{info["description"]}<br>'
+            f'📐 {info["formula"]}<br>'
+            f'💡 {info["tip"]}</div>',
+            unsafe_allow_html=True,
+        )
+        if st.button("✅ 基本統計を理解した！"):
+            add_experience(10)
+
+    elif analysis_mode == "グラフ表示":
+        mean_val, median_val, _, _ = basic_stats(df, selected_column)
+
+        fig = hist_fig(df, selected_column, mean_val, median_val)
+        st.plotly_chart(fig, use_container_width=True)
+
+        fig_box = box_fig(df, selected_column)
+        st.plotly_chart(fig_box, use_container_width=True)
+
+        if st.button("✅ グラフを読み取れた！"):
+            add_experience(15)
+
+    elif analysis_mode == "相関関係":
+        other_columns = [c for c in numeric_columns if c != selected_column]
+        if not other_columns:
+            st.warning("相関を調べるには数値列が2つ以上必要です。")
+        else:
+            second_column = st.selectbox("比較する列", other_columns)
+            corr = corr_of(df, selected_column, second_column)
+
+            st.metric("相関係数", f"{corr:.3f}")
+            if abs(corr) >= 0.7:
+                st.success("💪 強い相関があります！")
+            elif abs(corr) >= 0.3:
+                st.info("🤝 中程度の相関があります。")
+            else:
+                st.warning("🤷 相関はほとんどありません。")
+
+            fig = scatter_fig(df, selected_column, second_column)
+            st.plotly_chart(fig, use_container_width=True)
+
+            difficulty = st.select_slider("ヒントの難易度", ["easy", "normal", "hard"])
+            st.caption(get_hint_for_difficulty("correlation", difficulty))
+
+            if st.button("✅ 相関を理解した！"):
+                add_experience(20)
+
+    elif analysis_mode == "時系列分析":
+        date_candidates = [
+            c for c in df.columns
+            if df[c].dtype == "object" or "日付" in c or "date" in c.lower()
+        ]
+        if not date_candidates:
+            st.warning("日付として使える列が見つかりません。")
+        else:
+            date_column = st.selectbox("日付の列", date_candidates)
+            try:
+                df[date_column] = parse_dates(df, date_column)
+            except (ValueError, TypeError):
+                st.error("日付として解釈できない列です。")
+                st.stop()
+
+            fig = line_fig(df, date_column, selected_column)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # 必要なのは前半・後半の平均だけなので、DataFrame全体のソートは
+            # せず、np.partitionで日付の中央値を求めてマスク平均で済ませる
+            d = df[date_column].to_numpy()
+            v = df[selected_column].to_numpy(dtype=np.float64, na_value=np.nan)
+            mid = np.partition(d, len(d) // 2)[len(d) // 2]
+            # 日付が重複していると前半が空になりうる。欠損値はnanmeanで除外する
+            first = v[d < mid]
+            second = v[d >= mid]
+            if (
+                first.size == 0
+                or np.isnan(first).all()
+                or np.isnan(second).all()
+            ):
+                st.info("🤔 前半と後半を比べられるだけのデータがありません。")
+            else:
+                first_mean = np.nanmean(first)
+                second_mean = np.nanmean(second)
+                if second_mean > first_mean:
+                    st.info(f"📈 後半の平均 ({second_mean:.2f}) は前半 ({first_mean:.2f}) より高く、上昇傾向です。")
+                else:
+                    st.info(f"📉 後半の平均 ({second_mean:.2f}) は前半 ({first_mean:.2f}) 以下で、下降傾向です。")
+
+            if st.button("✅ トレンドを読み取れた！"):
+                add_experience(25)
+
+
+# ---------------------------------------------------------------------------
+# メイン: データの読み込み
+# ---------------------------------------------------------------------------
+st.markdown('<div class="main-header">📊 データ分析学習アプリ</div>', unsafe_allow_html=True)
+
+if st.session_state.pop("level_up", False):
+    st.balloons()
+    st.success(f"🎊 レベルアップ！ {get_level_title(st.session_state.level)} になりました！")
+
+col_upload, col_sample = st.columns(2)
+with col_upload:
+    uploaded_file = st.file_uploader("CSVファイルをアップロード", type=["csv"])
+    if uploaded_file is not None:
+        data = uploaded_file.getvalue()
+        token = (uploaded_file.name, hashlib.md5(data).hexdigest())
+        # 再実行のたびに再代入するとDataFrameが毎回別オブジェクトになり、
+        # idベースのキャッシュ(basic_stats等)が効かなくなる。内容が
+        # 変わったときだけ読み込み、フレームを再実行をまたいで同一に保つ。
+        if st.session_state.get("upload_token") != token:
+            st.session_state.weather_data = load_csv(data, uploaded_file.name)
+            st.session_state.upload_token = token
+        st.success("✅ データを読み込みました！")
+
+with col_sample:
+    st.write("データがない場合はこちら:")
+    if st.button("🎲 サンプルデータを生成"):
+        st.session_state.weather_data = make_sample_weather()
+        st.success("✅ サンプルデータを生成しました！")
+
+# ---------------------------------------------------------------------------
+# メイン: データ分析
+# ---------------------------------------------------------------------------
+if "weather_data" in st.session_state:
+    df = st.session_state.weather_data
+
+    # dtype走査はここで1回だけ行い、以降はこの結果を使い回す
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    numeric_columns = numeric_cols.tolist()
+
+    st.subheader("📋 データの概要")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("行数", len(df))
+    c2.metric("列数", len(df.columns))
+    c3.metric("数値列数", len(numeric_cols))
+
+    with st.expander("データを見る"):
+        st.dataframe(df, use_container_width=True)
+
+    if not numeric_columns:
+        st.warning("数値列が見つかりません。数値データを含むCSVをアップロードしてください。")
+        st.stop()
+
+    analysis_panel(df, numeric_columns)
+
+else:
+    st.info("👆 まずはCSVをアップロードするか、サンプルデータを生成してください。")
@@ -0,0 +1,162 @@
+"""統計概念の学習サポートモジュール
+
+データ分析学習アプリ(app.py)から利用される教育用コンポーネント。
+統計概念の解説・学習ステップのガイド・フィードバック生成を提供する。
+
+解説データはすべて不変なので、インスタンスごとに辞書を作り直さず
+モジュールレベルの定数(MappingProxyTypeで読み取り専用化)を共有する。
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+
+_CONCEPTS = MappingProxyType({
+    "mean": {
+        "name": "平均値",
+        "description": "すべてのデータを足して、データの個数で割った値です。データ全体の「中心」を表します。",
+        "formula": "平均値 = データの合計 ÷ データの個数",
+        "example": "テストの点数が 60, 70, 80 点なら、平均値は (60+70+80)÷3 = 70 点です。",
+        "tip": "極端に大きい・小さい値（外れ値）があると、平均値は引っ張られてしまいます。",
+    },
+    "median": {
+        "name": "中央値",
+        "description": "データを小さい順に並べたとき、ちょうど真ん中にくる値です。",
+        "formula": "データを並べ替えて、中央の位置にある値",
+        "example": "1, 2, 100 というデータなら、中央値は 2 です（平均値は約34）。",
+        "tip": "外れ値の影響を受けにくいので、年収など偏ったデータの代表値に向いています。",
+    },
+    "mode": {
+        "name": "最頻値",
+        "description": "データの中で最も多く登場する値です。",
+        "formula": "出現回数が最大の値",
+        "example": "晴れ, 晴れ, 雨, 曇り なら、最頻値は「晴れ」です。",
+        "tip": "カテゴリデータ（天気や血液型など）の代表値として便利です。",
+    },
+    "std": {
+        "name": "標準偏差",
+        "description": "データが平均値からどれくらい散らばっているかを表す値です。",
+        "formula": "標準偏差 = √(分散) = √(偏差の2乗の平均)",
+        "example": "気温の標準偏差が大きい地域は、寒暖差が激しい地域です。",
+        "tip": "標準偏差が小さいほど、データは平均値の近くに集まっています。",
+    },
+    "correlation": {
+        "name": "相関係数",
+        "description": "2つのデータの関係の強さを -1 から 1 の値で表します。",
+        "formula": "相関係数 r = 共分散 ÷ (それぞれの標準偏差の積)",
+        "example": "気温とアイスの売上には正の相関（気温が上がると売上も上がる）があります。",
+        "tip": "相関があっても因果関係があるとは限りません！",
+    },
+})
+
+_LEARNING_STEPS = MappingProxyType({
+    1: {
+        "title": "データと友だちになろう",
+        "description": "まずはデータを読み込んで、どんな値が入っているか眺めてみましょう。",
+        "goal": "サンプルデータを生成するか、CSVをアップロードする",
+    },
+    2: {
+        "title": "基本統計量を知ろう",
+        "description": "平均値・中央値・標準偏差でデータの特徴をつかみましょう。",
+        "goal": "基本統計モードで1つの列を分析する",
+    },
+    3: {
+        "title": "グラフで可視化しよう",
+        "description": "ヒストグラムや箱ひげ図で、データの分布を目で確認しましょう。",
+        "goal": "グラフ表示モードでヒストグラムを描く",
+    },
+    4: {
+        "title": "関係性を探ろう",
+        "description": "2つの列の相関を調べて、データ同士のつながりを発見しましょう。",
+        "goal": "相関関係モードで散布図と相関係数を確認する",
+    },
+    5: {
+        "title": "時間の流れを読もう",
+        "description": "時系列分析で、データが時間とともにどう変化するかを調べましょう。",
+        "goal": "時系列分析モードでトレンドを確認する",
+    },
+})
+
+_ACHIEVEMENTS = MappingProxyType({
+    "first_data": "🎉 はじめてのデータ読み込み！",
+    "first_stats": "📊 はじめての統計分析！",
+    "first_graph": "📈 はじめてのグラフ作成！",
+    "first_corr": "🔗 はじめての相関分析！",
+    "level_5": "⭐ レベル5到達！",
+    "level_10": "👑 気象マスター認定！",
+})
+
+# (概念, 難易度) のフラットなキーにして、ネストした辞書2段の
+# ハッシュ参照を1回に減らす。
+_HINTS = MappingProxyType({
+    ("mean", "easy"): "平均値は「みんなで山分けしたらいくつ？」と考えてみましょう。",
+    ("mean", "normal"): "平均値と中央値を比べると、分布の偏りが見えてきます。",
+    ("mean", "hard"): "外れ値に強い代表値が必要なら、トリム平均も検討しましょう。",
+    ("std", "easy"): "標準偏差は「散らばり具合のものさし」です。",
+    ("std", "normal"): "平均値±標準偏差の範囲に、多くのデータが収まります。",
+    ("std", "hard"): "正規分布なら約68%のデータが平均±1σに入ります。",
+    ("correlation", "easy"): "散布図の点が右上がりなら正の相関です。",
+    ("correlation", "normal"): "相関係数の絶対値が0.7以上なら強い相関と言えます。",
+    ("correlation", "hard"): "疑似相関に注意。第三の変数が隠れていないか考えましょう。",
+})
+
+
+@lru_cache(maxsize=None)
+def explain_concept(concept_name):
+    """指定された統計概念の解説を返す"""
+    return _CONCEPTS.get(
+        concept_name, {"error": f"「{concept_name}」の解説はまだ準備されていません。"}
+    )
+
+
+@lru_cache(maxsize=None)
+def get_step(step):
+    """指定されたステップの学習ガイドを返す"""
+    return _LEARNING_STEPS.get(step, _LEARNING_STEPS[1])
+
+
+_ENCOURAGEMENT_THRESHOLDS = (20, 40, 60, 80)
+_ENCOURAGEMENT_MESSAGES = (
+    "🌱 学習スタート！一歩ずつ進んでいきましょう。",
+    "🌿 いい調子です！データの見方が身についてきました。",
+    "🌳 順調に成長中！分析の幅が広がっています。",
+    "🏆 すごい！もうすぐデータ分析マスターです。",
+    "🎉 素晴らしい！あなたはもう立派なデータ分析者です！",
+)
+
+
+def generate_encouragement(progress_percent):
+    """学習の進捗率に応じた励ましメッセージを返す"""
+    # bisect_right で従来の「progress_percent < 閾値」の境界判定を保つ
+    return _ENCOURAGEMENT_MESSAGES[
+        bisect_right(_ENCOURAGEMENT_THRESHOLDS, progress_percent)
+    ]
+
+
+def get_hint_for_difficulty(concept, difficulty):
+    """概念と難易度に応じたヒントを返す"""
+    return _HINTS.get((concept, difficulty), "この概念のヒントはまだ準備中です。")
+
+
+# 旧API互換のための薄いシム。状態を持たないため、実体は上のモジュール関数。
+class StatsConceptExplainer:
+    """統計概念をやさしい言葉で解説するクラス(互換シム)"""
+
+    concepts = _CONCEPTS
+    explain_concept = staticmethod(explain_concept)
+
+
+class LearningProgressGuide:
+    """学習の進め方をガイドするクラス(互換シム)"""
+
+    learning_steps = _LEARNING_STEPS
+    get_step = staticmethod(get_step)
+
+
+class FeedbackSystem:
+    """学習者への励ましとヒントを生成するクラス(互換シム)"""
+
+    achievements = _ACHIEVEMENTS
+    hints = _HINTS
+    generate_encouragement = staticmethod(generate_encouragement)
+    get_hint_for_difficulty = staticmethod(get_hint_for_difficulty)